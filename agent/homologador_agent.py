@@ -7,9 +7,30 @@ que implementa as mesmas interfaces mas com funcionalidade limitada.
 """
 
 import logging
+import time
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Mensagem anexada a todas as respostas do stub
+STUB_MENSAGEM = "Esta é uma implementação temporária (stub) do HomologadorAgent"
+
+_iso_second: tuple[int, str] = (-1, "")
+
+
+def _isoformat_now() -> str:
+    """Equivalente a `datetime.now().isoformat()`, formatando data/hora apenas uma vez por segundo"""
+    global _iso_second
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _iso_second = (second, prefix)  # troca atômica da tupla, segura entre threads
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}"
+
 
 class HomologadorAgent:
     """
@@ -20,17 +41,19 @@ class HomologadorAgent:
         self,
         model: str = "computer-use-preview",
         computer: Optional[Any] = None,
-        tools: list[dict] = [],
+        tools: list[dict] | None = None,
         acknowledge_safety_check_callback: Callable = lambda: False,
         projeto_id: Optional[str] = None,
         distribuidora_codigo: Optional[str] = None,
     ):
         self.projeto_id = projeto_id
         self.distribuidora_codigo = distribuidora_codigo
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.logger.info(
-            f"[STUB] Inicializando HomologadorAgent para projeto {projeto_id} "
-            f"na distribuidora {distribuidora_codigo}"
+            "[STUB] Inicializando HomologadorAgent para projeto %s "
+            "na distribuidora %s",
+            projeto_id,
+            distribuidora_codigo,
         )
 
     def iniciar_homologacao(self, projeto_data: Dict) -> List[Dict]:
@@ -43,7 +66,7 @@ class HomologadorAgent:
         Returns:
             Lista de ações realizadas
         """
-        self.logger.info(f"[STUB] Iniciando homologação para projeto {self.projeto_id}")
+        self.logger.info("[STUB] Iniciando homologação para projeto %s", self.projeto_id)
 
         # Simular ações de homologação
         return [
@@ -52,8 +75,8 @@ class HomologadorAgent:
                 "projeto_id": self.projeto_id,
                 "distribuidora": self.distribuidora_codigo,
                 "status": "em_analise",
-                "mensagem": "Esta é uma implementação temporária (stub) do HomologadorAgent",
-                "timestamp": datetime.now().isoformat(),
+                "mensagem": STUB_MENSAGEM,
+                "timestamp": _isoformat_now(),
             }
         ]
 
@@ -68,14 +91,14 @@ class HomologadorAgent:
         Returns:
             Resultado da consulta
         """
-        self.logger.info(f"[STUB] Consultando {orgao} sobre {consulta}")
+        self.logger.info("[STUB] Consultando %s sobre %s", orgao, consulta)
 
         return {
             "orgao": orgao,
             "consulta": consulta,
             "resultado": "consulta_simulada",
-            "mensagem": "Esta é uma implementação temporária (stub) do HomologadorAgent",
-            "timestamp": datetime.now().isoformat(),
+            "mensagem": STUB_MENSAGEM,
+            "timestamp": _isoformat_now(),
         }
 
 
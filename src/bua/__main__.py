@@ -1,12 +1,6 @@
 import argparse
-from bua.agent.agent import Agent
-from bua.computers.config import *
-from bua.computers.default import *
-from bua.computers import computers_config
 
-from dotenv import load_dotenv
-
-_ = load_dotenv()
+from bua.computers.config import computers_config, get_computer
 
 
 def acknowledge_safety_check_callback(message: str) -> bool:
@@ -56,7 +50,15 @@ def main():
         default="bua",
     )
     args = parser.parse_args()
-    ComputerClass = computers_config[args.computer]
+
+    # heavy imports are deferred until after argument parsing (keeps `--help` fast)
+    from dotenv import load_dotenv
+
+    _ = load_dotenv()
+
+    from bua.agent.agent import Agent
+
+    ComputerClass = get_computer(args.computer)
 
     if args.model == "bua":
         model = "bua-v1"
@@ -74,7 +76,7 @@ def main():
         items = []
 
         if args.computer in ["browserbase", "local-playwright"]:
-            if not args.start_url.startswith("http"):
+            if not args.start_url.startswith(("http://", "https://")):
                 args.start_url = "https://" + args.start_url
             agent.computer.goto(args.start_url)
 
@@ -1,22 +1,30 @@
-from pydantic import BaseModel
-from bua.computers.actions import ActionUnion, CompletionAction, HelpAction, InteractionAction
+from bua.computers.actions import CompletionAction, HelpAction, InteractionAction, parse_action
 import logging
 from bua.computers.computer import Browser
 from bua.computers import Computer
 from bua.utils import (
     create_response,
     show_image,
+    image_data_url,
     pp,
     sanitize_message,
     check_blocklisted_url,
 )
+import contextlib
 import json
+from collections import defaultdict
+import sys
 from typing import Any, Callable
 from halo import Halo
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    json_loads = json.loads
 
-class ActionParse(BaseModel):
-    action: ActionUnion
+
+# spinners only make sense on an interactive terminal (no render thread in CI / servers)
+_spinner = Halo if sys.stdout.isatty() else lambda text=None: contextlib.nullcontext()
 
 
 class Agent:
@@ -30,160 +38,189 @@ class Agent:
         self,
         model="computer-use-preview",
         computer: Computer = None,
-        tools: list[dict] = [],
+        tools: list[dict] | None = None,
         acknowledge_safety_check_callback: Callable = lambda: False,
     ):
         self.model = model
         self.computer: Computer | Browser = computer
-        self.tools = tools
+        self.tools = list(tools) if tools else []
         self.print_steps = True
         self.debug = False
         self.show_images = False
         self.acknowledge_safety_check_callback = acknowledge_safety_check_callback
+        # per-response usages are only kept in debug mode, totals are always aggregated
         self.usages: list[dict[str, Any]] = []
+        self.usage_totals: defaultdict[str, int] = defaultdict(int)
+        self._last_checked_url: str | None = None
+        self._item_handlers: dict[str, Callable[[dict], list[dict]]] = {
+            "message": self._handle_message,
+            "browser_call": self._handle_browser_call,
+            "function_call": self._handle_function_call,
+            "computer_call": self._handle_computer_call,
+        }
+        # public methods the model may invoke through function calls, resolved once
+        self._computer_methods: dict[str, Callable] = {
+            name: method
+            for name in dir(computer)
+            if not name.startswith("_") and callable(method := getattr(computer, name, None))
+        } if computer else {}
 
         if computer:
             dimensions = computer.get_dimensions()
-            self.tools += [
+            self.tools.append(
                 {
                     "type": "computer-preview",
                     "display_width": dimensions[0],
                     "display_height": dimensions[1],
                     "environment": computer.get_environment(),
                 },
-            ]
+            )
 
     def debug_print(self, *args):
         if self.debug:
             pp(*args)
 
-    def handle_item(self, item):
-        """Handle each item; may cause a computer action + screenshot."""
-        if item["type"] == "message":
-            if self.print_steps:
-                print(item["content"][0]["text"])
-
-        if item["type"] == "browser_call":
-            if not self.model.startswith("bua"):
-                raise NotImplementedError("Can only use browser calls with bua ")
-
-            if not isinstance(self.computer, Browser):
-                raise NotImplementedError(
-                    f"Cannot execute browser calls on computer of type {type(self.computer)}"
-                )
+    def record_usage(self, usage: dict[str, Any]) -> None:
+        for key, value in usage.items():
+            if isinstance(value, int):
+                self.usage_totals[key] += value
+        if self.debug:
+            self.usages.append(usage)
 
-            action = item["action"]
-
-            # TODO: transform from dict back to action
-
-            action_model = ActionParse(action=action)
-            if isinstance(action_model.action, CompletionAction):
-                status_emoji = "✅" if action_model.action.success else "❌" 
-                print(f"{status_emoji} Step finished: {action_model.action.answer}")
-                return [
-                    {
-                        "type": "message",
-                        "role": "assistant",
-                        "content": action_model.action.answer,
-                    }
-                ]
-            elif isinstance(action_model.action, HelpAction):
-                print(f"Requiring more help for the task: {action_model.action.reason}")
-                return [
-                    {
-                        "type": "message",
-                        "role": "assistant",
-                        "content": action_model.action.reason,
-                    }
-                ]
-            elif isinstance(action_model.action, InteractionAction):
-                logging.info(f"✅ Step: {action_model.action.execution_message()}")
-
-            with Halo(action_model.action.execution_message()):
-                self.computer.execute_action(action_model.action)
-
-            screenshot_base64 = self.computer.screenshot()
-            dom = self.computer.dom()
-
-            # TODO: safety checks
-
-            call_output = {
-                "type": "browser_call_output",
-                "call_id": item["call_id"],
-                "acknowledged_safety_checks": [],
-                "output": {
-                    "type": "bua_output",
-                    "image_url": f"data:image/png;base64,{screenshot_base64}",
-                    "dom": dom,
-                },
-            }
+    def check_url(self, url: str) -> None:
+        """Blocklist check, skipped when the page hasn't navigated since the last step."""
+        if url != self._last_checked_url:
+            check_blocklisted_url(url)
+            self._last_checked_url = url
 
-            # additional URL safety checks for browser environments
-            current_url = self.computer.get_current_url()
-            check_blocklisted_url(current_url)
-            call_output["output"]["current_url"] = current_url
+    def handle_item(self, item):
+        """Handle each item; may cause a computer action + screenshot."""
+        handler = self._item_handlers.get(item["type"])
+        if handler is None:
+            return []
+        return handler(item)
+
+    def _handle_message(self, item):
+        if self.print_steps:
+            print(item["content"][0]["text"])
+        return []
 
-            return [call_output]
+    def _handle_browser_call(self, item):
+        if not self.model.startswith("bua"):
+            raise NotImplementedError("Can only use browser calls with bua ")
 
-        if item["type"] == "function_call":
-            name, args = item["name"], json.loads(item["arguments"])
-            if self.print_steps:
-                print(f"{name}({args})")
+        if not isinstance(self.computer, Browser):
+            raise NotImplementedError(
+                f"Cannot execute browser calls on computer of type {type(self.computer)}"
+            )
 
-            if hasattr(self.computer, name):  # if function exists on computer, call it
-                method = getattr(self.computer, name)
-                method(**args)
+        action = parse_action(item["action"])
+        if isinstance(action, CompletionAction):
+            status_emoji = "✅" if action.success else "❌" 
+            print(f"{status_emoji} Step finished: {action.answer}")
+            return [
+                {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": action.answer,
+                }
+            ]
+        elif isinstance(action, HelpAction):
+            print(f"Requiring more help for the task: {action.reason}")
             return [
                 {
-                    "type": "function_call_output",
-                    "call_id": item["call_id"],
-                    "output": "success",  # hard-coded output for demo
+                    "type": "message",
+                    "role": "assistant",
+                    "content": action.reason,
                 }
             ]
 
-        if item["type"] == "computer_call":
-            if not self.model.startswith("computer-use"):
-                raise NotImplementedError("Can only use computer calls with bua")
-            action = item["action"]
-            action_type = action["type"]
-            action_args = {k: v for k, v in action.items() if k != "type"}
-            if self.print_steps:
-                print(f"{action_type}({action_args})")
-
-            method = getattr(self.computer, action_type)
-            method(**action_args)
-
-            screenshot_base64 = self.computer.screenshot()
-            if self.show_images:
-                show_image(screenshot_base64)
-
-            # if user doesn't ack all safety checks exit with error
-            pending_checks = item.get("pending_safety_checks", [])
-            for check in pending_checks:
-                message = check["message"]
-                if not self.acknowledge_safety_check_callback(message):
-                    raise ValueError(
-                        f"Safety check failed: {message}. Cannot continue with unacknowledged safety checks."
-                    )
-
-            call_output = {
-                "type": "computer_call_output",
+        execution_message = action.execution_message()
+        if isinstance(action, InteractionAction):
+            logging.info("✅ Step: %s", execution_message)
+
+        with _spinner(execution_message):
+            self.computer.execute_action(action)
+
+        screenshot_base64, dom, current_url = self.computer.capture_state()
+
+        # TODO: safety checks
+
+        call_output = {
+            "type": "browser_call_output",
+            "call_id": item["call_id"],
+            "acknowledged_safety_checks": [],
+            "output": {
+                "type": "bua_output",
+                "image_url": image_data_url(screenshot_base64),
+                "dom": dom,
+            },
+        }
+
+        # additional URL safety checks for browser environments
+        self.check_url(current_url)
+        call_output["output"]["current_url"] = current_url
+
+        return [call_output]
+
+    def _handle_function_call(self, item):
+        name, args = item["name"], json_loads(item["arguments"])
+        if self.print_steps:
+            print(f"{name}({args})")
+
+        method = self._computer_methods.get(name)
+        if method is not None:  # if function exists on computer, call it
+            method(**args)
+        return [
+            {
+                "type": "function_call_output",
                 "call_id": item["call_id"],
-                "acknowledged_safety_checks": pending_checks,
-                "output": {
-                    "type": "input_image",
-                    "image_url": f"data:image/png;base64,{screenshot_base64}",
-                },
+                "output": "success",  # hard-coded output for demo
             }
+        ]
+
+    def _handle_computer_call(self, item):
+        if not self.model.startswith("computer-use"):
+            raise NotImplementedError("Can only use computer calls with bua")
+        action = item["action"]
+        action_type = action["type"]
+        action_args = {k: v for k, v in action.items() if k != "type"}
+        if self.print_steps:
+            print(f"{action_type}({action_args})")
+
+        method = getattr(self.computer, action_type)
+        method(**action_args)
+
+        screenshot_base64 = self.computer.screenshot()
+        if self.show_images:
+            show_image(screenshot_base64)
+
+        # if user doesn't ack all safety checks exit with error
+        pending_checks = item.get("pending_safety_checks", [])
+        for check in pending_checks:
+            message = check["message"]
+            if not self.acknowledge_safety_check_callback(message):
+                raise ValueError(
+                    f"Safety check failed: {message}. Cannot continue with unacknowledged safety checks."
+                )
 
-            # additional URL safety checks for browser environments
-            if self.computer.get_environment() == "browser":
-                current_url = self.computer.get_current_url()
-                check_blocklisted_url(current_url)
-                call_output["output"]["current_url"] = current_url
+        call_output = {
+            "type": "computer_call_output",
+            "call_id": item["call_id"],
+            "acknowledged_safety_checks": pending_checks,
+            "output": {
+                "type": "input_image",
+                "image_url": image_data_url(screenshot_base64),
+            },
+        }
+
+        # additional URL safety checks for browser environments
+        if self.computer.get_environment() == "browser":
+            current_url = self.computer.get_current_url()
+            self.check_url(current_url)
+            call_output["output"]["current_url"] = current_url
 
-            return [call_output]
-        return []
+        return [call_output]
 
     def run_full_turn(
         self,
@@ -196,22 +233,28 @@ class Agent:
         self.debug = debug
         self.show_images = show_images
         new_items = []
+        # full model input, grown in place instead of rebuilding input_items + new_items each step
+        combined_items = list(input_items)
+        # sanitized once, then only extended with the items added since the last step
+        sanitized_items = [sanitize_message(msg) for msg in input_items] if debug else []
 
         # keep looping until we get a final response
         # or run out of steps
-        while new_items[-1].get("role") != "assistant" if new_items else True:
-
-            self.debug_print([sanitize_message(msg) for msg in input_items + new_items])
+        while True:
+            if self.debug:
+                already_sanitized = len(sanitized_items) - len(input_items)
+                sanitized_items += [sanitize_message(msg) for msg in new_items[already_sanitized:]]
+                self.debug_print(sanitized_items)
 
-            with Halo("Thinking"):
+            with _spinner("Thinking"):
                 response = create_response(
                     model=self.model,
-                    input=input_items + new_items,
+                    input=combined_items,
                     tools=self.tools,
                     truncation="auto",
                 )
                 if self.model.startswith("bua"):
-                    self.usages.append(response["usage"])
+                    self.record_usage(response["usage"])
             self.debug_print(response)
 
             if "output" not in response and self.debug:
@@ -219,7 +262,15 @@ class Agent:
                 raise ValueError("No output from model")
             else:
                 new_items += response["output"]
+                combined_items += response["output"]
                 for item in response["output"]:
-                    new_items += self.handle_item(item)
+                    handled_items = self.handle_item(item)
+                    new_items += handled_items
+                    combined_items += handled_items
+
+            # the turn ends once the model (or a completion/help action) answers
+            last_item = new_items[-1] if new_items else None
+            if isinstance(last_item, dict) and last_item.get("role") == "assistant":
+                break
 
         return new_items
@@ -4,19 +4,44 @@ Personalização do agente para homologação de projetos de geração distribu
 com interação automatizada junto às concessionárias e órgãos responsáveis.
 """
 
-from pydantic import BaseModel
-from bua.computers.actions import ActionUnion
+import functools
 import logging
 from bua.computers import Computer
 from typing import Callable, List, Dict, Optional
-from datetime import datetime
+from bua.utils import isoformat_now
 
 # Importações específicas do projeto Homologacao
 from api.services.gd.distribuidoras_gd_service import DistribuidorasGDService
 
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
-class ActionParse(BaseModel):
-    action: ActionUnion
+
+@functools.cache
+def _get_service() -> DistribuidorasGDService:
+    """Instância única do serviço, criada apenas no primeiro uso"""
+    return DistribuidorasGDService()
+
+
+class DistribuidoraNaoEncontrada(LookupError):
+    """Nenhuma distribuidora cadastrada com o código informado"""
+
+
+@functools.lru_cache(maxsize=128)
+def _fetch_distribuidora(codigo: str):
+    """
+    Busca a distribuidora, memoizada por código.
+
+    Só distribuidoras encontradas ficam em cache: quando não encontrada, levanta
+    `DistribuidoraNaoEncontrada` (exceções não são memoizadas), e a próxima busca consulta o
+    serviço de novo.
+    O modelo retornado é compartilhado: use `model_dump()` para obter uma cópia dos dados.
+    Use `_fetch_distribuidora.cache_clear()` para invalidar (ex: em testes).
+    """
+    distribuidora = _get_service().obter_distribuidora_por_codigo(codigo)
+    if not distribuidora:
+        raise DistribuidoraNaoEncontrada(codigo)
+    return distribuidora
 
 
 class Agent:
@@ -29,12 +54,12 @@ class Agent:
         self,
         model="computer-use-preview",
         computer: Optional[Computer] = None,
-        tools: list[dict] = [],
+        tools: list[dict] | None = None,
         acknowledge_safety_check_callback: Callable = lambda: False,
     ):
         self.model = model
         self.computer = computer
-        self.tools = tools
+        self.tools = list(tools) if tools else []
         self.print_steps = True
         self.debug = False
         self.show_images = False
@@ -43,14 +68,14 @@ class Agent:
 
         if computer:
             dimensions = computer.get_dimensions()
-            self.tools += [
+            self.tools.append(
                 {
                     "type": "computer-preview",
                     "display_width": dimensions[0],
                     "display_height": dimensions[1],
                     "environment": computer.get_environment(),
                 },
-            ]
+            )
 
     def debug_print(self, *args):
         if self.debug:
@@ -87,7 +112,7 @@ class HomologadorAgent(Agent):
         self,
         model="computer-use-preview",
         computer: Optional[Computer] = None,
-        tools: list[dict] = [],
+        tools: list[dict] | None = None,
         acknowledge_safety_check_callback: Callable = lambda: False,
         projeto_id: Optional[str] = None,
         distribuidora_codigo: Optional[str] = None,
@@ -98,7 +123,7 @@ class HomologadorAgent(Agent):
         self.distribuidora_codigo = distribuidora_codigo
         self.distribuidora_data = None
         self.homologacao_steps = []
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
 
         # Carregar dados da distribuidora se especificado
         if distribuidora_codigo:
@@ -110,41 +135,42 @@ class HomologadorAgent(Agent):
             return
 
         try:
-            service = DistribuidorasGDService()
-            distribuidora = service.obter_distribuidora_por_codigo(
+            # model_dump() gera um dict novo para cada agente: o modelo em cache não é alterado
+            self.distribuidora_data = _fetch_distribuidora(
                 self.distribuidora_codigo
+            ).model_dump()
+            self.logger.info(
+                "Dados da distribuidora %s carregados",
+                self.distribuidora_codigo,
+            )
+        except DistribuidoraNaoEncontrada:
+            self.logger.warning(
+                "Distribuidora %s não encontrada", self.distribuidora_codigo
             )
-            if distribuidora:
-                self.distribuidora_data = distribuidora.model_dump()
-                self.logger.info(
-                    f"Dados da distribuidora {self.distribuidora_codigo} "
-                    "carregados"
-                )
-            else:
-                self.logger.warning(
-                    f"Distribuidora {self.distribuidora_codigo} não encontrada"
-                )
         except Exception as e:
-            self.logger.error(f"Erro ao carregar dados da distribuidora: {e}")
+            self.logger.error("Erro ao carregar dados da distribuidora: %s", e)
 
-    def _get_portal_url(self) -> Optional[str]:
-        """Obtém a URL do portal de homologação da distribuidora"""
+    @functools.cached_property
+    def portal_url(self) -> Optional[str]:
+        """URL do portal de homologação da distribuidora"""
         if (self.distribuidora_data and
                 "portal_homologacao" in self.distribuidora_data):
             portal = self.distribuidora_data["portal_homologacao"]
             return portal.get("url")
         return None
 
-    def _get_autenticacao_info(self) -> Optional[Dict]:
-        """Obtém informações de autenticação do portal"""
+    @functools.cached_property
+    def autenticacao_info(self) -> Optional[Dict]:
+        """Informações de autenticação do portal"""
         if (self.distribuidora_data and
                 "portal_homologacao" in self.distribuidora_data):
             portal = self.distribuidora_data["portal_homologacao"]
             return portal.get("autenticacao")
         return None
 
-    def _get_documentos_requeridos(self) -> List[Dict]:
-        """Obtém lista de documentos requeridos para homologação"""
+    @functools.cached_property
+    def documentos_requeridos(self) -> List[Dict]:
+        """Lista de documentos requeridos para homologação"""
         if (
             self.distribuidora_data
             and "documentos_requeridos" in self.distribuidora_data
@@ -163,11 +189,11 @@ class HomologadorAgent(Agent):
             Lista de ações realizadas
         """
         self.logger.info(
-            f"Iniciando homologação para projeto {self.projeto_id}"
+            "Iniciando homologação para projeto %s", self.projeto_id
         )
 
         # Etapa 1: Navegar para o portal da distribuidora
-        portal_url = self._get_portal_url()
+        portal_url = self.portal_url
         if not portal_url:
             return [{
                 "type": "error",
@@ -175,7 +201,7 @@ class HomologadorAgent(Agent):
             }]
 
         # Etapa 2: Realizar autenticação se necessário
-        auth_info = self._get_autenticacao_info()
+        auth_info = self.autenticacao_info
         if auth_info:
             self._realizar_autenticacao(auth_info)
 
@@ -186,7 +212,7 @@ class HomologadorAgent(Agent):
         self._preencher_formulario_solicitacao(projeto_data)
 
         # Etapa 5: Upload de documentos requeridos
-        documentos = self._get_documentos_requeridos()
+        documentos = self.documentos_requeridos
         self._upload_documentos(documentos, projeto_data)
 
         # Etapa 6: Submeter solicitação
@@ -200,7 +226,7 @@ class HomologadorAgent(Agent):
             "projeto_id": self.projeto_id,
             "distribuidora": self.distribuidora_codigo,
             "status": status,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": isoformat_now()
         }]
 
     def _realizar_autenticacao(self, auth_info: Dict):
@@ -231,8 +257,19 @@ class HomologadorAgent(Agent):
 
     def _upload_documentos(self, documentos: List[Dict], projeto_data: Dict):
         """Faz upload dos documentos requeridos"""
-        self.logger.info(f"Fazendo upload de {len(documentos)} documentos")
-        # Implementar upload de documentos
+        self.logger.info("Fazendo upload de %d documentos", len(documentos))
+        # Uploads em sequência: o upload passa pelo `computer` (Playwright síncrono),
+        # que não pode ser usado a partir de outras threads
+        for documento in documentos:
+            self._upload_documento(documento, projeto_data)
+
+    def _upload_documento(self, documento: Dict, projeto_data: Dict):
+        """
+        Faz upload de um único documento
+
+        Usa `self.computer`, que só pode ser acessado pela thread do agente: não chamar em paralelo.
+        """
+        # Implementar upload do documento
         pass
 
     def _submeter_solicitacao(self):
@@ -258,14 +295,14 @@ class HomologadorAgent(Agent):
         Returns:
             Resultado da consulta
         """
-        self.logger.info(f"Consultando {orgao} sobre {consulta}")
+        self.logger.info("Consultando %s sobre %s", orgao, consulta)
 
         # Implementar consulta específica
         return {
             "orgao": orgao,
             "consulta": consulta,
             "resultado": "consulta_realizada",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": isoformat_now()
         }
 
     def run_full_turn(
@@ -1,11 +1,12 @@
-from . import default
-from . import contrib
+# `default` and `contrib` are imported on demand (`from bua.computers import default`)
+# so that importing the package doesn't load every backend SDK.
 from .computer import Computer
-from .config import computers_config
+from .config import computers_config, get_computer
 
 __all__ = [
     "default",
     "contrib",
     "Computer",
     "computers_config",
+    "get_computer",
 ]
@@ -1,19 +1,23 @@
 from __future__ import annotations
 
-import inspect
 import operator
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
-from functools import reduce
-from typing import Annotated, Any, Literal
+from functools import lru_cache, reduce
+from typing import TYPE_CHECKING, Annotated, Any, ClassVar, Literal
+from weakref import WeakKeyDictionary
 
 import logging
-from playwright.sync_api import BrowserContext as Window
-from playwright.sync_api import FrameLocator, Locator, Page
-from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing_extensions import override
 
+if TYPE_CHECKING:
+    # only needed for annotations: the models can be imported and validated without playwright
+    from playwright.sync_api import BrowserContext as Window
+    from playwright.sync_api import FrameLocator, Locator, Page
+
+logger = logging.getLogger(__name__)
+
 # ############################################################
 # Action enums
 # ############################################################
@@ -29,23 +33,20 @@ AllActionRole = ActionRole | Literal["all"]
 # ############################################################
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NodeSelectors:
     css_selector: str
     xpath_selector: str
     notte_selector: str
     in_iframe: bool
     in_shadow_root: bool
-    iframe_parent_css_selectors: list[str]
+    iframe_parent_css_selectors: tuple[str, ...]
     playwright_selector: str | None = None
 
-    def selectors(self) -> list[str]:
-        selector_list: list[str] = []
+    def selectors(self) -> tuple[str, ...]:
         if self.playwright_selector is not None:
-            selector_list.append(self.playwright_selector)
-        selector_list.append(self.css_selector)
-        selector_list.append(self.xpath_selector)
-        return selector_list
+            return (self.playwright_selector, self.css_selector, self.xpath_selector)
+        return (self.css_selector, self.xpath_selector)
 
 
 def locale_element_in_iframes(page: Page, selectors: NodeSelectors) -> FrameLocator | Page:
@@ -69,11 +70,16 @@ def locate_element(page: Page, selectors: NodeSelectors) -> Locator:
         frame = locale_element_in_iframes(page, selectors)
     # regular case, locate element + scroll into view if needed
 
-    for selector in [f"css={selectors.css_selector}", f"xpath={selectors.xpath_selector}"]:
+    # most specific selector first: a unique match stops the search after a single round-trip.
+    # `count()` is kept (rather than probing `locator.first`) so that ambiguous selectors are skipped
+    candidates = [f"css={selectors.css_selector}", f"xpath={selectors.xpath_selector}"]
+    if selectors.playwright_selector is not None:
+        candidates.insert(0, selectors.playwright_selector)
+    for selector in candidates:
         locator = frame.locator(selector)
         count = locator.count()
         if count > 1:
-            logging.warning(f"Found {count} elements for '{selector}'. Check out the dom tree for more details.")
+            logger.warning("Found %s elements for '%s'. Check out the dom tree for more details.", count, selector)
         elif count == 1:
             return locator
     raise ValueError(
@@ -86,45 +92,64 @@ def locate_element(page: Page, selectors: NodeSelectors) -> Locator:
 # ############################################################
 
 ACTION_REGISTRY: dict[str, type[BaseAction]] = {}
+# action `type` literal -> action class, for direct dispatch when parsing
+ACTION_DISPATCH: dict[str, type[BaseAction]] = {}
+# bumped on every registration, invalidates the cached action union
+_REGISTRY_VERSION = 0
+
+_BASE_NON_AGENT_FIELDS = frozenset(
+    {
+        # Base action fields
+        "selectors",
+        "category",
+        "description",
+        # Interaction action fields
+        "selector",
+        "press_enter",
+        "option_selector",
+        "text_label",
+        # executable action fields
+        "params",
+        "code",
+        "status",
+        "locator",
+    }
+)
 
 
 class BaseAction(BaseModel, metaclass=ABCMeta):
     """Base model for all actions."""
 
-    def __init_subclass__(cls, **kwargs: dict[Any, Any]):
-        super().__init_subclass__(**kwargs)  # type: ignore
+    # value of the `type` literal, resolved once when a concrete action class is registered
+    _TYPE: ClassVar[str]
 
-        if not inspect.isabstract(cls):
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        # called once pydantic has built the model, so `model_fields` is available
+        super().__pydantic_init_subclass__(**kwargs)
+
+        # ABCMeta has already computed the abstract methods of the finished class at this point
+        if not cls.__abstractmethods__:
+            global _REGISTRY_VERSION
+            cls._TYPE = cls.model_fields["type"].default
             ACTION_REGISTRY[cls.__name__] = cls
+            ACTION_DISPATCH[cls._TYPE] = cls
+            _REGISTRY_VERSION += 1
 
     @abstractmethod
-    def _execution_message(self) -> str:
+    def _execution_message(self, suffix: str) -> str:
+        # `suffix` is "ing" or "ed", interpolated in the same pass as the action fields
         raise NotImplementedError
 
     def execution_message(self, past: bool = False) -> str:
-        suffix = "ed" if past else "ing"
-        return self._execution_message().format(suffix=suffix)
+        return self._execution_message("ed" if past else "ing")
 
     @classmethod
-    def non_agent_fields(cls) -> set[str]:
-        fields = {
-            # Base action fields
-            "selectors",
-            "category",
-            "description",
-            # Interaction action fields
-            "selector",
-            "press_enter",
-            "option_selector",
-            "text_label",
-            # executable action fields
-            "params",
-            "code",
-            "status",
-            "locator",
-        }
+    @lru_cache(maxsize=None)
+    def non_agent_fields(cls) -> frozenset[str]:
+        fields = _BASE_NON_AGENT_FIELDS
         if "selector" in cls.model_fields or "locator" in cls.model_fields:
-            fields.remove("id")
+            fields = fields - {"id"}
 
         return fields
 
@@ -160,8 +185,8 @@ class HelpAction(BaseAction):
     reason: str
 
     @override
-    def _execution_message(self) -> str:
-        return f"Requir{{suffix}} help for task: {self.reason}"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Requir{suffix} help for task: {self.reason}"
 
 class CompletionAction(BaseAction):
     type: Literal["completion"] = "completion"
@@ -170,8 +195,8 @@ class CompletionAction(BaseAction):
     answer: str
 
     @override
-    def _execution_message(self) -> str:
-        return f"Complet{{suffix}} the task, answer: {self.answer}"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Complet{suffix} the task, answer: {self.answer}"
 
 
 # ############################################################
@@ -179,14 +204,18 @@ class CompletionAction(BaseAction):
 # ############################################################
 
 
-def long_wait(page: Page, goto_timeout: float = 10_000) -> None:
+def long_wait(page: Page, goto_timeout: float = 10_000, selector: str | None = None) -> None:
+    # `networkidle` is rarely reached on modern pages (analytics, websockets) and used to burn the
+    # whole timeout: wait for the DOM instead, and optionally for the element the caller needs next
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
     try:
-        page.wait_for_load_state("networkidle", timeout=goto_timeout)
+        page.wait_for_load_state("domcontentloaded", timeout=goto_timeout)
+        if selector is not None:
+            page.locator(selector).first.wait_for(state="visible", timeout=goto_timeout)
     except PlaywrightTimeoutError:
         pass
 
-    short_wait(page)
-
 
 def short_wait(page: Page, timeout: float = 500) -> None:
     page.wait_for_timeout(timeout)
@@ -200,13 +229,13 @@ class GotoAction(BrowserAction):
     @override
     def execute(self, browser: Window, page: Page) -> None:
         url = self.url
-        if not (url.startswith("http") or url.startswith("https")):
+        if not url.startswith(("http://", "https://")):
             url = "https://" + url
         _ = page.goto(url)
 
     @override
-    def _execution_message(self) -> str:
-        return f"Navigat{{suffix}} to '{self.url}' in current tab"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Navigat{suffix} to '{self.url}' in current tab"
 
 
 # TODO: implement the rest of browser actions
@@ -280,8 +309,8 @@ class GoBackAction(BrowserAction):
     description: str = Field(default="Go back to the previous page", exclude=True)
 
     @override
-    def _execution_message(self) -> str:
-        return "Navigat{suffix} back to the previous page"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Navigat{suffix} back to the previous page"
 
     @override
     def execute(self, browser: Window, page: Page) -> None:
@@ -293,8 +322,8 @@ class GoForwardAction(BrowserAction):
     description: str = Field(default="Go forward to the nextpage (only works if we previously went back)", exclude=True)
 
     @override
-    def _execution_message(self) -> str:
-        return "Navigat{suffix} forward to the next page"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Navigat{suffix} forward to the next page"
 
     @override
     def execute(self, browser: Window, page: Page) -> None:
@@ -306,8 +335,8 @@ class ReloadAction(BrowserAction):
     description: str = Field(default="Reload the current page", exclude=True)
 
     @override
-    def _execution_message(self) -> str:
-        return "Reload{suffix} the current page"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Reload{suffix} the current page"
 
     @override
     def execute(self, browser: Window, page: Page) -> None:
@@ -321,8 +350,8 @@ class WaitAction(BrowserAction):
     description: str = Field(default="Wait for a given amount of miliseconds", exclude=True)
 
     @override
-    def _execution_message(self) -> str:
-        return f"Wait{{suffix}} for {self.time_ms} milliseconds"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Wait{suffix} for {self.time_ms} milliseconds"
 
     @override
     def execute(self, browser: Window, page: Page) -> None:
@@ -335,29 +364,40 @@ class PressKeyAction(BrowserAction):
     description: str = Field(default="Press a provided key on the keyboard", exclude=True)
 
     @override
-    def _execution_message(self) -> str:
-        return f"Press{{suffix}} the keyboard key: {self.key}"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Press{suffix} the keyboard key: {self.key}"
 
     @override
     def execute(self, browser: Window, page: Page) -> None:
         page.keyboard.press(self.key)
 
 
+# viewport height used for "one page" scrolls, read once per page
+_VIEWPORT_HEIGHT_CACHE: WeakKeyDictionary[Page, int] = WeakKeyDictionary()
+
+
+def _viewport_height(page: Page) -> int:
+    height = _VIEWPORT_HEIGHT_CACHE.get(page)
+    if height is None:
+        viewport = page.viewport_size
+        height = viewport["height"] if viewport else page.evaluate("window.innerHeight")
+        _VIEWPORT_HEIGHT_CACHE[page] = height
+    return height
+
+
 class ScrollUpAction(BrowserAction):
     type: Literal["scroll_up"] = "scroll_up"
     amount: int | None = None
     description: str = Field(default="Scroll up, either by a provided amount of pixels, or one full page", exclude=True)
 
     @override
-    def _execution_message(self) -> str:
-        return f"Scroll{{suffix}} up by {str(self.amount) + ' pixels' if self.amount is not None else 'one page'}"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Scroll{suffix} up by {str(self.amount) + ' pixels' if self.amount is not None else 'one page'}"
 
     @override
     def execute(self, browser: Window, page: Page) -> None:
-        if self.amount is not None:
-            page.mouse.wheel(delta_x=0, delta_y=-self.amount)
-        else:
-            page.keyboard.press("PageUp")
+        delta = self.amount if self.amount is not None else _viewport_height(page)
+        page.mouse.wheel(delta_x=0, delta_y=-delta)
 
 
 class ScrollDownAction(BrowserAction):
@@ -368,15 +408,13 @@ class ScrollDownAction(BrowserAction):
     )
 
     @override
-    def _execution_message(self) -> str:
-        return f"Scroll{{suffix}} down by {str(self.amount) + ' pixels' if self.amount is not None else 'one page'}"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Scroll{suffix} down by {str(self.amount) + ' pixels' if self.amount is not None else 'one page'}"
 
     @override
     def execute(self, browser: Window, page: Page) -> None:
-        if self.amount is not None:
-            page.mouse.wheel(delta_x=0, delta_y=self.amount)
-        else:
-            page.keyboard.press("PageDown")
+        delta = self.amount if self.amount is not None else _viewport_height(page)
+        page.mouse.wheel(delta_x=0, delta_y=delta)
 
 
 # ############################################################
@@ -390,10 +428,10 @@ class ClickAction(InteractionAction):
     description: str = Field(default="Click on an element of the current page", exclude=True)
 
     @override
-    def _execution_message(self) -> str:
+    def _execution_message(self, suffix: str) -> str:
         if self.text_label is None:
-            return f"Click{{suffix}} on element {self.id}"
-        return f"Click{{suffix}} on the element with text label: {self.text_label}"
+            return f"Click{suffix} on element {self.id}"
+        return f"Click{suffix} on the element with text label: {self.text_label}"
 
     @override
     def execute(self, browser: Window, page: Page, locator: Locator) -> None:
@@ -407,13 +445,19 @@ class FillAction(InteractionAction):
     description: str = Field(default="Fill an input field on the current page", exclude=True)
 
     @override
-    def _execution_message(self) -> str:
-        return f"Fill{{suffix}} the input field '{self.text_label}' with the value: '{self.value}'"
+    def _execution_message(self, suffix: str) -> str:
+        return f"Fill{suffix} the input field '{self.text_label}' with the value: '{self.value}'"
 
     @override
     def execute(self, browser: Window, page: Page, locator: Locator) -> None:
         locator.fill(self.value, timeout=10_000, force=self.clear_before_fill)
-        short_wait(page)
+        # returns as soon as the page is loaded instead of always sleeping
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        try:
+            page.wait_for_load_state("domcontentloaded", timeout=500)
+        except PlaywrightTimeoutError:
+            pass
 
 
 class CheckAction(InteractionAction):
@@ -423,9 +467,9 @@ class CheckAction(InteractionAction):
     value: bool
 
     @override
-    def _execution_message(self) -> str:
+    def _execution_message(self, suffix: str) -> str:
         return (
-            f"Check{{suffix}} the checkbox '{self.text_label}'"
+            f"Check{suffix} the checkbox '{self.text_label}'"
             if self.text_label is not None
             else "Checked the checkbox"
         )
@@ -455,6 +499,31 @@ class CheckAction(InteractionAction):
 #         pass
 
 
+SELECT_INFO_JS = """el => ({
+    tag: el.tagName.toLowerCase(),
+    options: el.tagName === "SELECT" ? Array.from(el.options).map(option => option.value) : null,
+})"""
+SELECT_OPTIONS_JS = "select => Array.from(select.options).map(option => option.value)"
+
+# tag names of elements already inspected, per page, keyed by xpath and reset when the page URL changes
+_ELEMENT_TAG_CACHE: WeakKeyDictionary[Page, tuple[str, dict[str, str]]] = WeakKeyDictionary()
+
+
+def _cached_tag_name(page: Page, xpath_selector: str) -> str | None:
+    cached = _ELEMENT_TAG_CACHE.get(page)
+    if cached is None or cached[0] != page.url:
+        return None
+    return cached[1].get(xpath_selector)
+
+
+def _cache_tag_name(page: Page, xpath_selector: str, tag_name: str) -> None:
+    url = page.url
+    cached = _ELEMENT_TAG_CACHE.get(page)
+    if cached is None or cached[0] != url:
+        cached = _ELEMENT_TAG_CACHE[page] = (url, {})
+    cached[1][xpath_selector] = tag_name
+
+
 class SelectDropdownOptionAction(InteractionAction):
     type: Literal["select_dropdown"] = "select_dropdown"
     id: str
@@ -467,24 +536,32 @@ class SelectDropdownOptionAction(InteractionAction):
     value: str | None = None
 
     @override
-    def _execution_message(self) -> str:
+    def _execution_message(self, suffix: str) -> str:
         return (
-            f"Select{{suffix}} the option '{self.value}' from the dropdown '{self.text_label}'"
+            f"Select{suffix} the option '{self.value}' from the dropdown '{self.text_label}'"
             if self.text_label is not None
             else "Selected the option from the dropdown"
         )
 
     @override
     def execute(self, browser: Window, page: Page, locator: Locator) -> None:
-        tag_name: str = locator.evaluate("el => el.tagName.toLowerCase()")
+        # the tag is cached for repeated actions on the same element; on a miss, tag and option
+        # values come in a single round-trip (options are only used in the error message)
+        xpath_selector = self.selectors.xpath_selector if self.selectors is not None else None
+        options: list[str] | None = None
+        tag_name = _cached_tag_name(page, xpath_selector) if xpath_selector is not None else None
+        if tag_name is None:
+            info: dict[str, Any] = locator.evaluate(SELECT_INFO_JS)
+            tag_name, options = info["tag"], info["options"]
+            if xpath_selector is not None:
+                _cache_tag_name(page, xpath_selector, tag_name)
         if tag_name == "select":
             # Handle standard HTML select
             try:
                 _ = locator.select_option(self.value)
             except Exception as e:
-                options = locator.evaluate("""
-                    select => Array.from(select.options).map(option => option.value)
-                """)
+                if options is None:
+                    options = locator.evaluate(SELECT_OPTIONS_JS)
                 message = f"Could not get find option value {self.value} ({e}). Possible values are {options}. Pick from these values or use a click action to interact."
                 raise ValueError(message)
         else:
@@ -492,4 +569,39 @@ class SelectDropdownOptionAction(InteractionAction):
             raise ValueError(message)
 
 
-ActionUnion = Annotated[reduce(operator.or_, ACTION_REGISTRY.values()), Field(discriminator="type")]
+@lru_cache(maxsize=1)
+def _build_action_union(registry_version: int) -> Any:
+    return Annotated[reduce(operator.or_, ACTION_REGISTRY.values()), Field(discriminator="type")]
+
+
+def get_action_union() -> Any:
+    """Discriminated union of all registered actions, only rebuilt when new actions are registered."""
+    return _build_action_union(_REGISTRY_VERSION)
+
+
+@lru_cache(maxsize=1)
+def _build_action_adapter(registry_version: int) -> TypeAdapter[BaseAction]:
+    return TypeAdapter(_build_action_union(registry_version))
+
+
+def get_action_adapter() -> TypeAdapter[BaseAction]:
+    """TypeAdapter over `get_action_union()`, only rebuilt when new actions are registered."""
+    return _build_action_adapter(_REGISTRY_VERSION)
+
+
+def parse_action_json(blob: str | bytes) -> BaseAction:
+    """Validate a raw JSON action with pydantic-core's parser, skipping the intermediate dict."""
+    return get_action_adapter().validate_json(blob)
+
+
+def parse_action(data: dict[str, Any]) -> BaseAction:
+    """Validate an action dict straight into the class registered for its `type`."""
+    try:
+        action_class = ACTION_DISPATCH[data["type"]]
+    except KeyError:
+        raise ValueError(f"Unknown action type: {data.get('type')!r}")
+    return action_class.model_validate(data)
+
+
+# union of the built-in actions, prefer `get_action_union()` to include actions registered later
+ActionUnion = get_action_union()
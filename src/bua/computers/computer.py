@@ -57,5 +57,7 @@ class Browser(Protocol):
 
     def get_current_url(self) -> str: ...
 
+    def capture_state(self) -> tuple[str, DomTreeDict, str]: ...
+
     def execute_action(self, action: BaseAction) -> None: ...
 
@@ -1,10 +1,14 @@
-from bua.computers.default.local_playwright import LocalPlaywrightBrowser
-from bua.computers.default.browserbase import BrowserbaseBrowser
-from bua.computers.default.notte import NotteBrowser
+import importlib
 
+# Backends are referenced as "module:ClassName" so that only the selected one is imported
 computers_config = {
-    "local-playwright": LocalPlaywrightBrowser,
-    "notte": NotteBrowser,
-    "browserbase": BrowserbaseBrowser,
+    "local-playwright": "bua.computers.default.local_playwright:LocalPlaywrightBrowser",
+    "notte": "bua.computers.default.notte:NotteBrowser",
+    "browserbase": "bua.computers.default.browserbase:BrowserbaseBrowser",
 }
 
+
+def get_computer(name: str) -> type:
+    """Import and return the computer class registered under `name`."""
+    module_name, class_name = computers_config[name].rsplit(":", 1)
+    return getattr(importlib.import_module(module_name), class_name)
@@ -44,6 +44,9 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
         self.bb = Browserbase(api_key=os.getenv("BROWSERBASE_API_KEY"))
         self.project_id = os.getenv("BROWSERBASE_PROJECT_ID")
         self.session = None
+        # CDP session reused across screenshots, bound to the page it was created for
+        self._cdp_session = None
+        self._cdp_page = None
         self.dimensions = (width, height)
         self.region = region
         self.proxy = proxy
@@ -142,11 +145,13 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
         """Handle the creation of a new page."""
         print("New page created")
         self._page = page
+        self._cdp_session = None
         page.on("close", self._handle_page_close)
 
     def _handle_page_close(self, page: Page):
         """Handle the closure of a page."""
         print("Page closed")
+        self._cdp_session = None
         if self._page == page:
             if self._browser.contexts[0].pages:
                 self._page = self._browser.contexts[0].pages[-1]
@@ -175,6 +180,13 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
                 f"Session completed. View replay at https://browserbase.com/sessions/{self.session.id}"
             )
 
+    def _get_cdp_session(self):
+        """Return the CDP session of the current page, attaching only when the page changed."""
+        if self._cdp_session is None or self._cdp_page is not self._page:
+            self._cdp_session = self._page.context.new_cdp_session(self._page)
+            self._cdp_page = self._page
+        return self._cdp_session
+
     def screenshot(self) -> str:
         """
         Capture a screenshot of the current viewport using CDP.
@@ -183,16 +195,14 @@ class BrowserbaseBrowser(BasePlaywrightComputer):
             str: A base64 encoded string of the screenshot.
         """
         try:
-            # Get CDP session from the page
-            cdp_session = self._page.context.new_cdp_session(self._page)
-
             # Capture screenshot using CDP
-            result = cdp_session.send(
+            result = self._get_cdp_session().send(
                 "Page.captureScreenshot", {"format": "png", "fromSurface": True}
             )
 
             return result["data"]
         except PlaywrightError as error:
+            self._cdp_session = None
             print(
                 f"CDP screenshot failed, falling back to standard screenshot: {error}"
             )
@@ -2,10 +2,9 @@ import os
 from typing import Tuple
 from playwright.sync_api import Browser, Page, Error as PlaywrightError
 from bua.computers.shared.base_playwright import BasePlaywrightComputer
-from notte_sdk.client import NotteClient
-from dotenv import load_dotenv
 
-_ = load_dotenv()
+# .env is loaded on the first NotteBrowser instantiation instead of at import time
+_dotenv_loaded = False
 
 
 class NotteBrowser(BasePlaywrightComputer):
@@ -34,9 +33,21 @@ class NotteBrowser(BasePlaywrightComputer):
             virtual_mouse (bool): Whether to enable the virtual mouse cursor. Default is True.
             ad_blocker (bool): Whether to enable the built-in ad blocker. Default is False.
         """
+        global _dotenv_loaded
+        if not _dotenv_loaded:
+            from dotenv import load_dotenv
+
+            _ = load_dotenv()
+            _dotenv_loaded = True
+
+        from notte_sdk.client import NotteClient
+
         super().__init__()
         self.notte = NotteClient(api_key=os.getenv("NOTTE_API_KEY"))
         self.session = None
+        # CDP session reused across screenshots, bound to the page it was created for
+        self._cdp_session = None
+        self._cdp_page = None
         self.dimensions = (width, height)
         self.proxy = proxy
 
@@ -74,11 +85,13 @@ class NotteBrowser(BasePlaywrightComputer):
         """Handle the creation of a new page."""
         print("New page created")
         self._page = page
+        self._cdp_session = None
         page.on("close", self._handle_page_close)
 
     def _handle_page_close(self, page: Page):
         """Handle the closure of a page."""
         print("Page closed")
+        self._cdp_session = None
         if self._page == page:
             if self._browser.contexts[0].pages:
                 self._page = self._browser.contexts[0].pages[-1]
@@ -107,6 +120,13 @@ class NotteBrowser(BasePlaywrightComputer):
                 f"Session completed. View replay at https://notte.com/sessions/{self.session.session_id}"
             )
 
+    def _get_cdp_session(self):
+        """Return the CDP session of the current page, attaching only when the page changed."""
+        if self._cdp_session is None or self._cdp_page is not self._page:
+            self._cdp_session = self._page.context.new_cdp_session(self._page)
+            self._cdp_page = self._page
+        return self._cdp_session
+
     def screenshot(self) -> str:
         """
         Capture a screenshot of the current viewport using CDP.
@@ -115,17 +135,15 @@ class NotteBrowser(BasePlaywrightComputer):
             str: A base64 encoded string of the screenshot.
         """
         try:
-            # Get CDP session from the page
-            cdp_session = self._page.context.new_cdp_session(self._page)
-
             # Capture screenshot using CDP
-            result = cdp_session.send("Page.captureScreenshot", {
+            result = self._get_cdp_session().send("Page.captureScreenshot", {
                 "format": "png",
                 "fromSurface": True
             })
 
             return result['data']
         except PlaywrightError as error:
+            self._cdp_session = None
             print(f"CDP screenshot failed, falling back to standard screenshot: {error}")
             return super().screenshot()
 
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 import time
 import base64
@@ -5,7 +6,7 @@ from typing import ClassVar, List, Dict
 from playwright.sync_api import sync_playwright, Browser, Page
 from bua.computers.actions import BaseAction, BrowserAction, InteractionAction, locate_element, short_wait
 from bua.computers.computer import DomTreeDict
-from bua.utils import check_blocklisted_url
+from bua.utils import is_blocklisted_url
 
 # Optional: key mapping if your model uses "CUA" style keys
 CUA_KEY_TO_PLAYWRIGHT_KEY = {
@@ -71,7 +72,7 @@ class BasePlaywrightComputer:
         def handle_route(route, request):
 
             url = request.url
-            if check_blocklisted_url(url):
+            if is_blocklisted_url(url):
                 print(f"Flagging blocked domain: {url}")
                 route.abort()
             else:
@@ -159,8 +160,13 @@ class BasePlaywrightComputer:
         """Subclasses must implement, returning (Browser, Page)."""
         raise NotImplementedError
 
+    @staticmethod
+    @cache
+    def _dom_tree_js() -> str:
+        return BasePlaywrightComputer.DOM_TREE_JS_PATH.read_text()
+
     def dom(self) -> DomTreeDict:
-        js_code = BasePlaywrightComputer.DOM_TREE_JS_PATH.read_text()
+        js_code = BasePlaywrightComputer._dom_tree_js()
         parsing_config = dict(highlight_elements=True, focus_element=-1, viewport_expansion=500)
 
         eval = self._page.evaluate(js_code, parsing_config)
@@ -170,6 +176,17 @@ class BasePlaywrightComputer:
 
         return eval
 
+    def capture_state(self) -> tuple[str, DomTreeDict, str]:
+        """
+        Capture the screenshot, DOM and current URL of the page after an action.
+
+        The sync Playwright API can't overlap calls, so the two driver round-trips
+        (screenshot + DOM evaluation) run back to back on the same page and the URL
+        is read from Playwright's locally tracked state, which costs no IPC.
+        """
+        screenshot_base64 = self.screenshot()
+        dom = self.dom()
+        return screenshot_base64, dom, self.get_current_url()
 
     def execute_action(self, action: BaseAction) -> None:
         """Execute the provided action: necessary for browsers"""
@@ -0,0 +1,100 @@
+"""
+Conversor de dados do Temporal com serialização JSON via orjson e compressão zstd
+"""
+
+import dataclasses
+from typing import Any, List, Optional, Sequence, Type
+
+import zstandard
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import (
+    CompositePayloadConverter,
+    DataConverter,
+    DefaultPayloadConverter,
+    JSONPlainPayloadConverter,
+    PayloadCodec,
+    value_to_type,
+)
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele, usa o conversor padrão do Temporal
+    orjson = None
+
+
+class OrjsonPayloadConverter(JSONPlainPayloadConverter):
+    """
+    Conversor "json/plain" que usa orjson, compatível com os payloads do conversor padrão
+
+    Valores que o orjson não serializa (ex: modelos pydantic) usam o conversor padrão.
+    """
+
+    def to_payload(self, value: Any) -> Optional[Payload]:
+        try:
+            data = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return super().to_payload(value)
+        return Payload(metadata={"encoding": self.encoding.encode()}, data=data)
+
+    def from_payload(self, payload: Payload, type_hint: Optional[Type] = None) -> Any:
+        try:
+            obj = orjson.loads(payload.data)
+        except orjson.JSONDecodeError as err:
+            raise RuntimeError("Failed parsing") from err
+        if type_hint:
+            obj = value_to_type(type_hint, obj)
+        return obj
+
+
+class OrjsonPayloadConverterSet(CompositePayloadConverter):
+    """Conversores padrão do Temporal, com o de JSON substituído pelo OrjsonPayloadConverter"""
+
+    def __init__(self) -> None:
+        super().__init__(
+            *(
+                OrjsonPayloadConverter() if isinstance(converter, JSONPlainPayloadConverter) else converter
+                for converter in DefaultPayloadConverter.default_encoding_payload_converters
+            )
+        )
+
+
+class ZstdPayloadCodec(PayloadCodec):
+    """
+    Comprime com zstd os payloads maiores que `limiar` bytes
+
+    Payloads pequenos são mantidos como estão: a compressão não compensa.
+    """
+
+    ENCODING = b"binary/zstd"
+
+    def __init__(self, limiar: int = 1024, nivel: int = 3) -> None:
+        self._limiar = limiar
+        self._compressor = zstandard.ZstdCompressor(level=nivel)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        resultado = []
+        for payload in payloads:
+            data = payload.SerializeToString()
+            if len(data) > self._limiar:
+                payload = Payload(
+                    metadata={"encoding": self.ENCODING}, data=self._compressor.compress(data)
+                )
+            resultado.append(payload)
+        return resultado
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [
+            Payload.FromString(self._decompressor.decompress(payload.data))
+            if payload.metadata.get("encoding") == self.ENCODING
+            else payload
+            for payload in payloads
+        ]
+
+
+# Conversor usado pelo cliente e pelo worker
+data_converter = DataConverter.default
+if orjson is not None:
+    data_converter = dataclasses.replace(data_converter, payload_converter_class=OrjsonPayloadConverterSet)
+# O codec é obrigatório: todo processo que lê payloads do Temporal (worker e API) precisa decodificá-los
+data_converter = dataclasses.replace(data_converter, payload_codec=ZstdPayloadCodec())
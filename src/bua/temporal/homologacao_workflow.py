@@ -2,28 +2,33 @@
 Integração com Temporal para gerenciamento de tarefas duráveis de homologação
 """
 
+import asyncio
 import logging
 import os
 import json
+import time
+from dataclasses import dataclass
 from typing import Dict, Optional, List, Any
 from datetime import datetime, timedelta
 
 # Import temporalio client
 from temporalio.client import Client
-from temporalio.common import RetryPolicy
+from temporalio.common import RetryPolicy, WorkflowIDReusePolicy
+from temporalio.service import KeepAliveConfig
 from temporalio import workflow, activity
 import httpx
 
 from api.core.config import settings
 from api.models.homologacao_models import HomologacaoJobRequest, JobStatus
 from services.bua.agent.homologador_agent import create_homologador_agent
+from bua.temporal.converter import data_converter
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
 # Define a duração máxima do workflow em 24 horas
 WORKFLOW_MAX_DURATION = timedelta(hours=24)
-# Define o tempo de retenção do histórico em 30 dias
+# Define o tempo de retenção do histórico em 30 dias (configurado no namespace do Temporal)
 WORKFLOW_RETENTION = timedelta(days=30)
 
 # Define a política de retry (tentativas 3x, começando com 1s, dobra a cada retry, timeout 30min)
@@ -35,6 +40,29 @@ DEFAULT_RETRY_POLICY = RetryPolicy(
     non_retryable_error_types=["ValueError", "KeyError"],
 )
 
+# Campos binários do request (arquivos brutos) que não são enviados ao workflow: ficariam
+# gravados no histórico do Temporal durante todo o período de retenção
+CAMPOS_BINARIOS_REQUEST = {"anexos_raw", "pdf_blob"}
+
+# Timeouts (start_to_close) das atividades
+INICIAR_TIMEOUT = timedelta(minutes=30)
+STATUS_TIMEOUT = timedelta(minutes=5)
+DOCUMENTOS_TIMEOUT = timedelta(minutes=10)
+NOTIFICACAO_TIMEOUT = timedelta(minutes=1)
+
+# Status do job retornado pela query "getStatus" enquanto o workflow não terminou
+STATUS_EM_ANDAMENTO = "em_andamento"
+
+# Tempo de espera pelo sinal de status da distribuidora antes de consultá-la diretamente
+# (configurável por HOMOLOGACAO_ESPERA_STATUS_MINUTOS, deve ser menor que WORKFLOW_MAX_DURATION)
+ESPERA_STATUS = timedelta(minutes=float(os.environ.get("HOMOLOGACAO_ESPERA_STATUS_MINUTOS", "10")))
+
+# Status informados pela distribuidora que encerram a análise do processo
+STATUS_HOMOLOGACAO_FINAIS = frozenset({"aprovado", "reprovado", "cancelado"})
+
+# Quantidade máxima de documentos enviados por execução de atividade (lotes submetidos em paralelo)
+MAX_DOCUMENTOS_POR_LOTE = 50
+
 
 # Definição das atividades
 @activity.defn
@@ -53,7 +81,7 @@ async def iniciar_homologacao_activity(
         Resultado da ação de homologação
     """
     logger.info(
-        f"Iniciando homologação para projeto {projeto_id} na distribuidora {distribuidora_codigo}"
+        "Iniciando homologação para projeto %s na distribuidora %s", projeto_id, distribuidora_codigo
     )
 
     try:
@@ -71,7 +99,7 @@ async def iniciar_homologacao_activity(
             "timestamp": datetime.now().isoformat(),
         }
     except Exception as e:
-        logger.error(f"Erro ao iniciar homologação: {e}")
+        logger.error("Erro ao iniciar homologação: %s", e)
         return {
             "status": "failed",
             "error": str(e),
@@ -93,7 +121,7 @@ async def consultar_status_homologacao_activity(
     Returns:
         Status atual da homologação
     """
-    logger.info(f"Consultando status de homologação para projeto {projeto_id}")
+    logger.info("Consultando status de homologação para projeto %s", projeto_id)
 
     try:
         # Criar agente homologador
@@ -109,7 +137,7 @@ async def consultar_status_homologacao_activity(
             "timestamp": datetime.now().isoformat(),
         }
     except Exception as e:
-        logger.error(f"Erro ao consultar status: {e}")
+        logger.error("Erro ao consultar status: %s", e)
         return {
             "status": "erro_consulta",
             "error": str(e),
@@ -132,7 +160,8 @@ async def submeter_documentos_activity(
     Returns:
         Resultado da submissão
     """
-    logger.info(f"Submetendo {len(documentos)} documentos para o projeto {projeto_id}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Submetendo %s documentos para o projeto %s", len(documentos), projeto_id)
 
     try:
         # Criar agente homologador
@@ -148,7 +177,50 @@ async def submeter_documentos_activity(
             "timestamp": datetime.now().isoformat(),
         }
     except Exception as e:
-        logger.error(f"Erro ao submeter documentos: {e}")
+        logger.error("Erro ao submeter documentos: %s", e)
+        return {
+            "status": "falha_envio",
+            "error": str(e),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+@activity.defn
+async def submeter_documentos_batch_activity(
+    projeto_id: str, distribuidora_codigo: str, documentos: List[Dict[str, str]]
+) -> Dict[str, Any]:
+    """
+    Atividade que submete um lote de documentos, agrupados por tipo
+
+    Cada grupo deve ser enviado à distribuidora em uma única requisição, em vez de uma por
+    documento. Por enquanto é um stub: os documentos são agrupados, mas o envio é simulado.
+
+    Args:
+        projeto_id: ID do projeto
+        distribuidora_codigo: Código da distribuidora
+        documentos: Lote de documentos a submeter
+
+    Returns:
+        Resultado da submissão do lote
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Submetendo lote de %s documentos para o projeto %s", len(documentos), projeto_id)
+
+    try:
+        grupos: Dict[str, List[Dict[str, str]]] = {}
+        for documento in documentos:
+            grupos.setdefault(documento.get("tipo", ""), []).append(documento)
+
+        # Em uma implementação real, enviaria cada grupo em uma requisição multipart
+        # Aqui estamos simulando
+        return {
+            "status": "enviado",
+            "documentos_enviados": len(documentos),
+            "envios": len(grupos),
+            "timestamp": datetime.now().isoformat(),
+        }
+    except Exception as e:
+        logger.error("Erro ao submeter lote de documentos: %s", e)
         return {
             "status": "falha_envio",
             "error": str(e),
@@ -170,7 +242,7 @@ async def enviar_notificacao_listmonk_activity(
     Returns:
         Resultado do envio da notificação.
     """
-    logger.info(f"Enviando notificação de status '{status}' para o projeto {job_details.get('projeto_id')}")
+    logger.info("Enviando notificação de status '%s' para o projeto %s", status, job_details.get("projeto_id"))
 
     listmonk_api_url = getattr(settings, "LISTMONK_API_URL", "http://listmonk:9000/api/tx")
     # Em um cenário real, o ID do template e o e-mail do assinante viriam do banco de dados ou da requisição.
@@ -196,17 +268,94 @@ async def enviar_notificacao_listmonk_activity(
             logger.info("Notificação enviada com sucesso via Listmonk.")
             return {"status": "success", "response": response.json()}
     except httpx.RequestError as e:
-        logger.error(f"Erro ao enviar notificação para Listmonk: {e}")
+        logger.error("Erro ao enviar notificação para Listmonk: %s", e)
         return {"status": "failed", "error": str(e)}
 
 
+@dataclass(slots=True)
+class StepRecord:
+    """Transição de etapa do workflow, com timestamp em nanossegundos desde a época"""
+
+    step: str
+    status: str
+    ts_ns: int
+    error: Optional[str] = None
+
+
 # Definição do workflow de homologação
 @workflow.defn
 class HomologacaoWorkflow:
     """
     Workflow para gerenciar o processo completo de homologação de um projeto
+
+    O status da análise é recebido via sinal (webhook da distribuidora) em vez de consultado
+    periodicamente.
     """
 
+    def __init__(self) -> None:
+        self._status: Optional[Dict[str, Any]] = None
+        self._concluido = False
+        self._steps: List[StepRecord] = []
+        self._resultado: Optional[Dict[str, Any]] = None
+
+    @workflow.query(name="getStatus")
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Status atual do workflow
+
+        Returns:
+            Resultado final do workflow, se já encerrado; senão, as etapas registradas até agora
+        """
+        if self._resultado is not None:
+            return self._resultado
+        return {
+            "job_id": workflow.info().workflow_id,
+            "status": STATUS_EM_ANDAMENTO,
+            "steps": self._steps,
+            "status_distribuidora": self._status,
+        }
+
+    @workflow.signal
+    def status_atualizado(self, novo_status: Dict[str, Any]) -> None:
+        """
+        Recebe uma atualização de status da distribuidora
+
+        Args:
+            novo_status: Status informado pela distribuidora
+        """
+        self._status = novo_status
+        if novo_status.get("status") in STATUS_HOMOLOGACAO_FINAIS:
+            self._concluido = True
+
+    @workflow.update
+    def marcar_concluido(self, status_final: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encerra a espera pelo status da distribuidora
+
+        Args:
+            status_final: Status final do processo
+
+        Returns:
+            Status registrado
+        """
+        self._status = status_final
+        self._concluido = True
+        return status_final
+
+    async def _aguardar_status(self, projeto_id: str, distribuidora_codigo: str) -> Dict[str, Any]:
+        """Aguarda o status final da distribuidora, consultando-a apenas se não houver retorno no prazo"""
+        try:
+            await workflow.wait_condition(lambda: self._concluido, timeout=ESPERA_STATUS)
+            return self._status
+        except asyncio.TimeoutError:
+            # A consulta é curta e roda como atividade local, sem ida e volta pela task queue
+            return await workflow.execute_local_activity(
+                consultar_status_homologacao_activity,
+                args=[projeto_id, distribuidora_codigo],
+                start_to_close_timeout=STATUS_TIMEOUT,
+                retry_policy=DEFAULT_RETRY_POLICY,
+            )
+
     @workflow.run
     async def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -222,111 +371,110 @@ class HomologacaoWorkflow:
         distribuidora_codigo = request["distribuidora_codigo"]
         projeto_data = request.get("projeto_data", {})
 
-        logger.info(f"Iniciando workflow de homologação para {projeto_id}")
+        logger.info("Iniciando workflow de homologação para %s", projeto_id)
 
-        # Registrar etapas do workflow
-        steps = []
+        # Registrar etapas do workflow (apenas transições: os resultados das atividades
+        # aparecem uma única vez, no resultado final, para não duplicar payloads no histórico)
+        steps = self._steps
 
         # Etapa 1: Iniciar homologação
-        steps.append(
-            {
-                "step": "iniciar_homologacao",
-                "status": "iniciado",
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+        steps.append(StepRecord("iniciar_homologacao", "iniciado", workflow.time_ns()))
 
         resultado_inicio = await workflow.execute_activity(
             iniciar_homologacao_activity,
-            projeto_id,
-            distribuidora_codigo,
-            projeto_data,
-            start_to_close_timeout=timedelta(minutes=30),
+            args=[projeto_id, distribuidora_codigo, projeto_data],
+            start_to_close_timeout=INICIAR_TIMEOUT,
             retry_policy=DEFAULT_RETRY_POLICY,
         )
 
         if resultado_inicio["status"] == "failed":
             steps.append(
-                {
-                    "step": "iniciar_homologacao",
-                    "status": "falhou",
-                    "timestamp": datetime.now().isoformat(),
-                    "error": resultado_inicio["error"],
-                }
+                StepRecord("iniciar_homologacao", "falhou", workflow.time_ns(), error=resultado_inicio["error"])
             )
 
             # Enviar notificação de falha
-            await workflow.execute_activity(
+            await workflow.execute_local_activity(
                 enviar_notificacao_listmonk_activity,
-                "falhou",
-                {"projeto_id": projeto_id, "distribuidora_codigo": distribuidora_codigo, "error": resultado_inicio["error"]},
-                start_to_close_timeout=timedelta(minutes=1),
+                args=[
+                    "falhou",
+                    {"projeto_id": projeto_id, "distribuidora_codigo": distribuidora_codigo, "error": resultado_inicio["error"]},
+                ],
+                start_to_close_timeout=NOTIFICACAO_TIMEOUT,
             )
 
-            return {
+            self._resultado = {
                 "job_id": workflow.info().workflow_id,
                 "status": JobStatus.FAILED.value,
                 "steps": steps,
                 "error": resultado_inicio["error"],
             }
-
-        steps.append(
-            {
-                "step": "iniciar_homologacao",
-                "status": "concluido",
-                "timestamp": datetime.now().isoformat(),
-                "result": resultado_inicio,
-            }
-        )
-
-        # Etapa 2: Consultar status (poderia ser um timer para consultas periódicas)
-        # Em um cenário real, isso poderia ser um loop com sleep
-        steps.append(
-            {
-                "step": "consultar_status",
-                "status": "iniciado",
-                "timestamp": datetime.now().isoformat(),
-            }
+            return self._resultado
+
+        steps.append(StepRecord("iniciar_homologacao", "concluido", workflow.time_ns()))
+
+        # Etapa 2: Aguardar o status da distribuidora
+        steps.append(StepRecord("consultar_status", "iniciado", workflow.time_ns()))
+
+        # A espera pelo status e o envio dos documentos são independentes: executados em paralelo.
+        # As notificações são curtas e rodam como atividades locais, no próprio worker do workflow
+        documentos = request.get("documentos", [])
+        lotes = [
+            documentos[i : i + MAX_DOCUMENTOS_POR_LOTE]
+            for i in range(0, len(documentos), MAX_DOCUMENTOS_POR_LOTE)
+        ]
+        resultado_consulta, *resultados_documentos = await asyncio.gather(
+            self._aguardar_status(projeto_id, distribuidora_codigo),
+            *(
+                workflow.execute_activity(
+                    submeter_documentos_batch_activity,
+                    args=[projeto_id, distribuidora_codigo, lote],
+                    start_to_close_timeout=DOCUMENTOS_TIMEOUT,
+                    retry_policy=DEFAULT_RETRY_POLICY,
+                )
+                for lote in lotes
+            ),
         )
 
-        resultado_consulta = await workflow.execute_activity(
-            consultar_status_homologacao_activity,
-            projeto_id,
-            distribuidora_codigo,
-            start_to_close_timeout=timedelta(minutes=5),
-            retry_policy=DEFAULT_RETRY_POLICY,
-        )
+        steps.append(StepRecord("consultar_status", "concluido", workflow.time_ns()))
 
-        steps.append(
-            {
-                "step": "consultar_status",
-                "status": "concluido",
-                "timestamp": datetime.now().isoformat(),
-                "result": resultado_consulta,
-            }
-        )
+        if resultados_documentos:
+            steps.append(StepRecord("submeter_documentos", "concluido", workflow.time_ns()))
 
         # Enviar notificação de sucesso
-        await workflow.execute_activity(
+        await workflow.execute_local_activity(
             enviar_notificacao_listmonk_activity,
-            "concluído",
-            {"projeto_id": projeto_id, "distribuidora_codigo": distribuidora_codigo},
-            start_to_close_timeout=timedelta(minutes=1),
+            args=["concluído", {"projeto_id": projeto_id, "distribuidora_codigo": distribuidora_codigo}],
+            start_to_close_timeout=NOTIFICACAO_TIMEOUT,
         )
 
         # Workflow concluído
-        return {
+        self._resultado = {
             "job_id": workflow.info().workflow_id,
             "status": JobStatus.COMPLETED.value,
             "projeto_id": projeto_id,
             "distribuidora_codigo": distribuidora_codigo,
             "steps": steps,
-            "result": {"inicio": resultado_inicio, "status": resultado_consulta},
+            "result": {
+                "inicio": resultado_inicio,
+                "status": resultado_consulta,
+                "documentos": resultados_documentos,
+            },
         }
+        return self._resultado
+
 
+# Cliente Temporal como singleton (o lock evita conexões duplicadas entre chamadas concorrentes)
+_temporal_client: Optional[Client] = None
+_temporal_client_lock = asyncio.Lock()
 
-# Cliente Temporal como singleton
-_temporal_client = None
+# Status finais não mudam mais: ficam em cache sem expiração
+STATUS_TERMINAIS = frozenset({JobStatus.COMPLETED.value, JobStatus.FAILED.value})
+_status_terminais: Dict[str, Dict[str, Any]] = {}
+
+# Status de workflows em andamento são reaproveitados por alguns segundos
+STATUS_CACHE_TTL = 5.0
+STATUS_CACHE_MAX = 10_000
+_status_recentes: Dict[str, tuple[float, Dict[str, Any]]] = {}
 
 
 async def get_temporal_client() -> Client:
@@ -338,19 +486,43 @@ async def get_temporal_client() -> Client:
     """
     global _temporal_client
 
-    if _temporal_client is None:
-        # Configurar conexão com o Temporal Server
-        temporal_host = os.environ.get("TEMPORAL_HOST", "localhost")
-        temporal_port = os.environ.get("TEMPORAL_PORT", "7233")
+    if _temporal_client is not None:
+        return _temporal_client
+
+    async with _temporal_client_lock:
+        if _temporal_client is None:
+            # Configurar conexão com o Temporal Server
+            temporal_host = os.environ.get("TEMPORAL_HOST", "localhost")
+            temporal_port = os.environ.get("TEMPORAL_PORT", "7233")
 
-        # Criar cliente
-        _temporal_client = await Client.connect(f"{temporal_host}:{temporal_port}")
+            # Pings de keepalive mantêm a conexão aberta entre requisições esparsas
+            keepalive_ms = int(float(os.environ.get("TEMPORAL_KEEPALIVE_SEGUNDOS", "30")) * 1000)
+
+            # Criar cliente
+            _temporal_client = await Client.connect(
+                f"{temporal_host}:{temporal_port}",
+                keep_alive_config=KeepAliveConfig(interval_millis=keepalive_ms),
+                data_converter=data_converter,
+            )
 
-        logger.info(f"Conectado ao Temporal Server em {temporal_host}:{temporal_port}")
+            logger.info("Conectado ao Temporal Server em %s:%s", temporal_host, temporal_port)
 
     return _temporal_client
 
 
+def preaquecer_temporal_client() -> "asyncio.Task[Client]":
+    """
+    Inicia a conexão com o Temporal em segundo plano
+
+    Deve ser chamada na inicialização da aplicação (ex: lifespan do FastAPI) para que a
+    primeira requisição não pague o handshake da conexão.
+
+    Returns:
+        Tarefa que resolve para o cliente Temporal
+    """
+    return asyncio.create_task(get_temporal_client())
+
+
 async def iniciar_homologacao_workflow(request: HomologacaoJobRequest) -> str:
     """
     Inicia um workflow de homologação no Temporal
@@ -364,23 +536,20 @@ async def iniciar_homologacao_workflow(request: HomologacaoJobRequest) -> str:
     # Obter cliente Temporal
     client = await get_temporal_client()
 
-    # Gerar ID do workflow (usar UUID ou projeto_id + timestamp)
-    workflow_id = f"homologacao-{request.projeto_id}-{int(datetime.now().timestamp())}"
+    # Gerar ID do workflow (projeto_id + timestamp em nanossegundos: único mesmo para envios no mesmo segundo)
+    workflow_id = f"homologacao-{request.projeto_id}-{time.time_ns()}"
 
     # Iniciar workflow
     await client.start_workflow(
         HomologacaoWorkflow.run,
-        request.model_dump(),
+        request.model_dump(exclude=CAMPOS_BINARIOS_REQUEST),
         id=workflow_id,
         task_queue="homologacao",
-        # Usar workflow_id como ID da execução para idempotência
-        execution_id=workflow_id,
-        # Não usar FIFO para permitir execução paralela de workflows diferentes
-        fifo=False,
-        retention_period=WORKFLOW_RETENTION,
+        # Rejeitar um segundo início com o mesmo ID (idempotência)
+        id_reuse_policy=WorkflowIDReusePolicy.REJECT_DUPLICATE,
     )
 
-    logger.info(f"Workflow de homologação iniciado: {workflow_id}")
+    logger.info("Workflow de homologação iniciado: %s", workflow_id)
 
     return workflow_id
 
@@ -395,6 +564,13 @@ async def consultar_homologacao_workflow(workflow_id: str) -> Optional[Dict[str,
     Returns:
         Resultado do workflow ou None se não encontrado
     """
+    # Status final ou consultado há pouco: evita uma chamada ao Temporal
+    if workflow_id in _status_terminais:
+        return _status_terminais[workflow_id]
+    recente = _status_recentes.get(workflow_id)
+    if recente is not None and recente[0] > time.monotonic():
+        return recente[1]
+
     # Obter cliente Temporal
     client = await get_temporal_client()
 
@@ -404,12 +580,89 @@ async def consultar_homologacao_workflow(workflow_id: str) -> Optional[Dict[str,
 
         # Verificar se o workflow existe e seu estado
         result = await handle.query("getStatus")
-
-        return result
     except Exception as e:
-        logger.error(f"Erro ao consultar workflow {workflow_id}: {e}")
+        logger.error("Erro ao consultar workflow %s: %s", workflow_id, e)
         return None
 
+    _status_recentes.pop(workflow_id, None)
+    if isinstance(result, dict) and result.get("status") in STATUS_TERMINAIS:
+        _status_terminais[workflow_id] = result
+    else:
+        if len(_status_recentes) >= STATUS_CACHE_MAX:
+            # Descarta a entrada mais antiga
+            del _status_recentes[next(iter(_status_recentes))]
+        _status_recentes[workflow_id] = (time.monotonic() + STATUS_CACHE_TTL, result)
+
+    return result
+
+
+async def consultar_homologacao_workflows_bulk(workflow_ids: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Consulta o estado de vários workflows de homologação com uma única listagem no Temporal
+
+    Workflows que não aparecem na listagem (ex: visibilidade ainda não atualizada) são
+    consultados individualmente.
+
+    Args:
+        workflow_ids: IDs dos workflows
+
+    Returns:
+        Estado de execução de cada workflow (ex: "RUNNING", "COMPLETED") ou None se não encontrado
+    """
+    if not workflow_ids:
+        return {}
+
+    # Obter cliente Temporal
+    client = await get_temporal_client()
+
+    estados: Dict[str, Optional[str]] = {}
+    query = f"WorkflowId IN ({', '.join(json.dumps(wid) for wid in workflow_ids)})"
+    try:
+        # A listagem traz as execuções mais recentes primeiro
+        async for execucao in client.list_workflows(query):
+            if execucao.id not in estados:
+                estados[execucao.id] = execucao.status.name if execucao.status else None
+    except Exception as e:
+        logger.error("Erro ao listar workflows: %s", e)
+
+    async def _descrever(workflow_id: str) -> Optional[str]:
+        try:
+            descricao = await client.get_workflow_handle(workflow_id).describe()
+            return descricao.status.name if descricao.status else None
+        except Exception as e:
+            logger.error("Erro ao consultar workflow %s: %s", workflow_id, e)
+            return None
+
+    faltantes = [wid for wid in workflow_ids if wid not in estados]
+    for workflow_id, estado in zip(faltantes, await asyncio.gather(*map(_descrever, faltantes))):
+        estados[workflow_id] = estado
+
+    return estados
+
+
+async def notificar_status_homologacao(workflow_id: str, novo_status: Dict[str, Any]) -> bool:
+    """
+    Repassa ao workflow uma atualização de status recebida da distribuidora (webhook)
+
+    Args:
+        workflow_id: ID do workflow
+        novo_status: Status informado pela distribuidora
+
+    Returns:
+        True se o sinal foi entregue, False caso contrário
+    """
+    # Obter cliente Temporal
+    client = await get_temporal_client()
+
+    try:
+        handle = client.get_workflow_handle(workflow_id)
+        await handle.signal(HomologacaoWorkflow.status_atualizado, novo_status)
+        _status_recentes.pop(workflow_id, None)
+        return True
+    except Exception as e:
+        logger.error("Erro ao notificar workflow %s: %s", workflow_id, e)
+        return False
+
 
 async def cancelar_homologacao_workflow(workflow_id: str, motivo: str) -> bool:
     """
@@ -431,10 +684,11 @@ async def cancelar_homologacao_workflow(workflow_id: str, motivo: str) -> bool:
 
         # Cancelar workflow com motivo
         await handle.cancel(reason=motivo)
+        _status_recentes.pop(workflow_id, None)
 
-        logger.info(f"Workflow {workflow_id} cancelado: {motivo}")
+        logger.info("Workflow %s cancelado: %s", workflow_id, motivo)
 
         return True
     except Exception as e:
-        logger.error(f"Erro ao cancelar workflow {workflow_id}: {e}")
+        logger.error("Erro ao cancelar workflow %s: %s", workflow_id, e)
         return False
@@ -2,8 +2,19 @@
 Módulo principal para executar o worker do Temporal.
 """
 import asyncio
+import os
+from typing import Any, Dict, Optional
+
+try:
+    import uvloop
+except ImportError:  # uvloop é opcional (não disponível no Windows): usa o loop padrão do asyncio
+    uvloop = None
+
 from temporalio.client import Client
-from temporalio.worker import Worker
+from temporalio.worker import Worker, WorkerTuner
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+
+from bua.temporal.converter import data_converter
 
 # Importe as atividades e workflows
 from bua.temporal.homologacao_workflow import (
@@ -11,31 +22,130 @@ from bua.temporal.homologacao_workflow import (
     iniciar_homologacao_activity,
     consultar_status_homologacao_activity,
     submeter_documentos_activity,
+    submeter_documentos_batch_activity,
     enviar_notificacao_listmonk_activity,
 )
 
 
+# Módulos importados pelo workflow que não precisam ser reimportados a cada sandbox: são
+# determinísticos no uso que o workflow faz deles, e reimportá-los domina o tempo de replay
+MODULOS_PASSTHROUGH = (
+    "api.core.config",
+    "api.models.homologacao_models",
+    "services.bua.agent",
+    "bua.temporal.converter",
+    "pydantic",
+    "httpx",
+)
+
+
+def _env_int(nome: str, padrao: int) -> int:
+    """Lê um inteiro de uma variável de ambiente, com valor padrão."""
+    return int(os.environ.get(nome, padrao))
+
+
+def _tuner() -> Optional[WorkerTuner]:
+    """
+    Tuner baseado em uso de CPU e memória, habilitado com TEMPORAL_RESOURCE_TUNER=1
+
+    Quando habilitado, substitui os limites fixos de slots.
+    """
+    if os.environ.get("TEMPORAL_RESOURCE_TUNER") != "1":
+        return None
+    return WorkerTuner.create_resource_based(
+        target_memory_usage=float(os.environ.get("TEMPORAL_TUNER_MEMORIA", "0.8")),
+        target_cpu_usage=float(os.environ.get("TEMPORAL_TUNER_CPU", "0.9")),
+    )
+
+
+def opcoes_worker_workflows() -> Dict[str, Any]:
+    """Opções de pollers e slots do worker de workflows, configuráveis por variáveis de ambiente"""
+    opcoes: Dict[str, Any] = {
+        "max_concurrent_workflow_task_polls": _env_int("TEMPORAL_WF_POLLERS", 10),
+        "max_cached_workflows": _env_int("TEMPORAL_MAX_CACHED_WORKFLOWS", 2000),
+    }
+    tuner = _tuner()
+    if tuner is not None:
+        opcoes["tuner"] = tuner
+    else:
+        opcoes["max_concurrent_workflow_tasks"] = _env_int("TEMPORAL_MAX_WORKFLOW_TASKS", 200)
+        opcoes["max_concurrent_local_activities"] = _env_int("TEMPORAL_MAX_LOCAL_ACTIVITIES", 100)
+    return opcoes
+
+
+def opcoes_worker_atividades() -> Dict[str, Any]:
+    """Opções de pollers e slots do worker de atividades, configuráveis por variáveis de ambiente"""
+    opcoes: Dict[str, Any] = {
+        "max_concurrent_activity_task_polls": _env_int("TEMPORAL_ACTIVITY_POLLERS", 10),
+    }
+    tuner = _tuner()
+    if tuner is not None:
+        opcoes["tuner"] = tuner
+    else:
+        opcoes["max_concurrent_activities"] = _env_int("TEMPORAL_MAX_ACTIVITIES", 100)
+    return opcoes
+
+
 async def main():
-    """Conecta ao servidor Temporal e inicia o worker."""
+    """
+    Conecta ao servidor Temporal e inicia os workers
+
+    Workflows e atividades rodam em workers separados, escalados de forma independente.
+    TEMPORAL_WORKER_MODO escolhe quais rodar neste processo: "workflows", "atividades" ou
+    "todos" (padrão).
+    """
+    modo = os.environ.get("TEMPORAL_WORKER_MODO", "todos")
+
     # Conecte ao servidor Temporal
-    client = await Client.connect("temporal:7233", namespace="homologacao")
-
-    # Crie um worker que escuta na task queue "homologacao"
-    worker = Worker(
-        client,
-        task_queue="homologacao",
-        workflows=[HomologacaoWorkflow],
-        activities=[
-            iniciar_homologacao_activity,
-            consultar_status_homologacao_activity,
-            submeter_documentos_activity,
-            enviar_notificacao_listmonk_activity,
-        ],
-    )
+    client = await Client.connect("temporal:7233", namespace="homologacao", data_converter=data_converter)
+
+    workers = []
+
+    if modo in ("todos", "workflows"):
+        # Worker de workflows: executa também as atividades locais chamadas pelo workflow,
+        # sem consumir as atividades comuns da task queue
+        workers.append(
+            Worker(
+                client,
+                task_queue="homologacao",
+                workflows=[HomologacaoWorkflow],
+                activities=[
+                    consultar_status_homologacao_activity,
+                    enviar_notificacao_listmonk_activity,
+                ],
+                no_remote_activities=True,
+                workflow_runner=SandboxedWorkflowRunner(
+                    restrictions=SandboxRestrictions.default.with_passthrough_modules(*MODULOS_PASSTHROUGH)
+                ),
+                **opcoes_worker_workflows(),
+            )
+        )
+
+    if modo in ("todos", "atividades"):
+        workers.append(
+            Worker(
+                client,
+                task_queue="homologacao",
+                activities=[
+                    iniciar_homologacao_activity,
+                    consultar_status_homologacao_activity,
+                    submeter_documentos_activity,
+                    submeter_documentos_batch_activity,
+                    enviar_notificacao_listmonk_activity,
+                ],
+                **opcoes_worker_atividades(),
+            )
+        )
+
+    if not workers:
+        raise ValueError(f"TEMPORAL_WORKER_MODO inválido: {modo}")
 
     print("Iniciando o worker do Temporal...")
-    await worker.run()
+    await asyncio.gather(*(worker.run() for worker in workers))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -1,4 +1,6 @@
 import os
+import re
+import time
 import requests
 from dotenv import load_dotenv
 import json
@@ -7,6 +9,8 @@ from PIL import Image
 from io import BytesIO
 import io
 from urllib.parse import urlparse
+from datetime import datetime
+from functools import lru_cache
 
 load_dotenv(override=True)
 
@@ -19,11 +23,34 @@ BLOCKED_DOMAINS = [
     "ilanbigio.com",
 ]
 
+# matches a blocked domain or any of its subdomains
+_BLOCKED_HOSTNAME_RE = re.compile(
+    r"(?:^|\.)(?:" + "|".join(re.escape(domain) for domain in BLOCKED_DOMAINS) + r")$"
+)
+
+
+PNG_DATA_URL_PREFIX = "data:image/png;base64,"
+
 
 def pp(obj):
     print(json.dumps(obj, indent=4))
 
 
+_iso_second: tuple[int, str] = (-1, "")
+
+
+def isoformat_now() -> str:
+    """Equivalent of `datetime.now().isoformat()`, formatting the date/time part once per second."""
+    global _iso_second
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _iso_second = (second, prefix)  # rebinding a tuple is atomic, concurrent callers stay consistent
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}"
+
+
 def show_image(base_64_image):
     image_data = base64.b64decode(base_64_image)
     image = Image.open(BytesIO(image_data))
@@ -36,9 +63,14 @@ def calculate_image_dimensions(base_64_image):
     return image.size
 
 
+def image_data_url(base_64_image: str) -> str:
+    """Wrap a base64 encoded PNG screenshot into the data URL expected by the APIs."""
+    return PNG_DATA_URL_PREFIX + base_64_image
+
+
 def sanitize_message(msg: dict) -> dict:
-    """Return a copy of the message with image_url omitted for computer_call_output messages."""
-    if msg.get("type") == "computer_call_output":
+    """Return a copy of the message with image_url omitted for computer/browser call outputs."""
+    if msg.get("type") in ("computer_call_output", "browser_call_output"):
         output = msg.get("output", {})
         if isinstance(output, dict):
             sanitized = msg.copy()
@@ -93,11 +125,18 @@ def create_bua_response(**kwargs):
     return response.json()
 
 
+@lru_cache(maxsize=1024)
+def _is_blocklisted_hostname(hostname: str) -> bool:
+    return _BLOCKED_HOSTNAME_RE.search(hostname) is not None
+
+
+def is_blocklisted_url(url: str) -> bool:
+    """Whether the given URL (including subdomains) is in the blocklist."""
+    # cached per hostname: request URLs are mostly unique, the hosts they hit are not
+    return _is_blocklisted_hostname(urlparse(url).hostname or "")
+
+
 def check_blocklisted_url(url: str) -> None:
     """Raise ValueError if the given URL (including subdomains) is in the blocklist."""
-    hostname = urlparse(url).hostname or ""
-    if any(
-        hostname == blocked or hostname.endswith(f".{blocked}")
-        for blocked in BLOCKED_DOMAINS
-    ):
+    if is_blocklisted_url(url):
         raise ValueError(f"Blocked URL: {url}")
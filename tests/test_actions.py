@@ -0,0 +1,39 @@
+import pytest
+
+from bua.computers.actions import (
+    ACTION_DISPATCH,
+    ACTION_REGISTRY,
+    CompletionAction,
+    GotoAction,
+    ScrollDownAction,
+    parse_action,
+)
+
+
+def test_dispatch_covers_every_registered_action():
+    assert set(ACTION_DISPATCH.values()) == set(ACTION_REGISTRY.values())
+    for type_, action_class in ACTION_DISPATCH.items():
+        assert action_class.model_fields["type"].default == type_
+
+
+def test_parse_action_dispatches_on_type():
+    action = parse_action({"type": "goto", "url": "https://example.com"})
+    assert isinstance(action, GotoAction)
+    assert action.url == "https://example.com"
+
+    action = parse_action({"type": "completion", "success": True, "answer": "done"})
+    assert isinstance(action, CompletionAction)
+
+    assert isinstance(parse_action({"type": "scroll_down"}), ScrollDownAction)
+
+
+@pytest.mark.parametrize("data", [{"type": "unknown"}, {"url": "https://example.com"}])
+def test_parse_action_rejects_unknown_type(data):
+    with pytest.raises(ValueError):
+        parse_action(data)
+
+
+def test_parse_action_validates_fields():
+    # pydantic's ValidationError is a ValueError
+    with pytest.raises(ValueError):
+        parse_action({"type": "goto"})
@@ -0,0 +1,12 @@
+from bua.agent.agent import Agent
+
+
+def test_agent_tools_are_not_shared():
+    assert Agent().tools is not Agent().tools
+
+
+def test_agent_does_not_mutate_given_tools():
+    tools = [{"type": "function", "name": "goto"}]
+    agent = Agent(tools=tools)
+    agent.tools.append({"type": "function", "name": "back"})
+    assert len(tools) == 1
@@ -0,0 +1,82 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+pytest.importorskip("orjson")
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter
+
+from bua.temporal.converter import OrjsonPayloadConverter, ZstdPayloadCodec, data_converter
+
+
+@dataclasses.dataclass
+class Registro:
+    step: str
+    ts_ns: int
+    error: str | None = None
+
+
+VALUES = [
+    {"projeto_id": "p1", "documentos": [{"tipo": "rg", "nome": "ação.pdf"}], "n": 3},
+    ["a", 1, 2.5, None, True],
+    "homologação",
+    2**70,  # beyond orjson's integer range: handled by the default encoder
+]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_round_trip(value):
+    payloads = data_converter.payload_converter.to_payloads([value])
+    assert payloads[0].metadata["encoding"] == b"json/plain"
+    assert data_converter.payload_converter.from_payloads(payloads) == [value]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_compatible_with_default_converter(value):
+    default = DataConverter.default.payload_converter
+    ours = data_converter.payload_converter
+    assert default.from_payloads(ours.to_payloads([value])) == [value]
+    assert ours.from_payloads(default.to_payloads([value])) == [value]
+
+
+def test_dataclass_round_trip_with_type_hint():
+    registro = Registro("iniciar_homologacao", 123)
+    payloads = data_converter.payload_converter.to_payloads([registro])
+    assert data_converter.payload_converter.from_payloads(payloads, [Registro]) == [registro]
+
+
+def test_sorted_keys():
+    payload = OrjsonPayloadConverter().to_payload({"b": 1, "a": 2})
+    assert payload.data == b'{"a":2,"b":1}'
+
+
+def _payload(size: int) -> Payload:
+    return Payload(metadata={"encoding": b"json/plain"}, data=b"a" * size)
+
+
+def test_codec_round_trip():
+    codec = ZstdPayloadCodec()
+    payloads = [_payload(10), _payload(10_000)]
+    encoded = asyncio.run(codec.encode(payloads))
+    assert encoded[0] == payloads[0]
+    assert encoded[1].metadata["encoding"] == ZstdPayloadCodec.ENCODING
+    assert len(encoded[1].data) < len(payloads[1].data)
+    assert asyncio.run(codec.decode(encoded)) == payloads
+
+
+def test_codec_threshold():
+    payload = _payload(2000)
+    size = len(payload.SerializeToString())
+    # payloads up to the threshold are left as they are
+    assert asyncio.run(ZstdPayloadCodec(limiar=size).encode([payload])) == [payload]
+    (encoded,) = asyncio.run(ZstdPayloadCodec(limiar=size - 1).encode([payload]))
+    assert encoded.metadata["encoding"] == ZstdPayloadCodec.ENCODING
+
+
+def test_data_converter_uses_codec():
+    assert isinstance(data_converter.payload_codec, ZstdPayloadCodec)
+    payloads = asyncio.run(data_converter.encode(["x" * 5000]))
+    assert payloads[0].metadata["encoding"] == ZstdPayloadCodec.ENCODING
+    assert asyncio.run(data_converter.decode(payloads)) == ["x" * 5000]
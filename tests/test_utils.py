@@ -0,0 +1,34 @@
+import pytest
+
+from bua.utils import check_blocklisted_url, is_blocklisted_url
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://ilanbigio.com",
+        "https://ilanbigio.com/some/path?q=1",
+        "http://www.ilanbigio.com",
+        "https://a.b.maliciousbook.com/",
+        "https://ILANBIGIO.COM",
+    ],
+)
+def test_blocklisted_urls(url):
+    assert is_blocklisted_url(url)
+    with pytest.raises(ValueError):
+        check_blocklisted_url(url)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://notilanbigio.com",
+        "https://ilanbigio.com.example.org",
+        "https://example.com/ilanbigio.com",
+        "https://bing.com",
+        "about:blank",
+    ],
+)
+def test_allowed_urls(url):
+    assert not is_blocklisted_url(url)
+    check_blocklisted_url(url)